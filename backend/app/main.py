@@ -1,9 +1,10 @@
 # backend/app/main.py
-from fastapi import FastAPI, UploadFile, File, HTTPException, Body, Form
+from fastapi import FastAPI, UploadFile, File, HTTPException, Body, Form, BackgroundTasks
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 import os
 import uvicorn
+from typing import List
 app = FastAPI(title="Legal Document Assistant API")
 
 # Import with error handling
@@ -12,6 +13,7 @@ try:
     from app.services.document_processor import process_document
     from app.services.summarizer import summarize_document
     from app.services.qa_engine import chat_with_documents
+    from app.services.batch_processor import create_batch_job, get_batch_job, run_batch_job
     IMPORTS_SUCCESSFUL = True
 except ImportError as e:
     print(f"Import error: {e}")
@@ -57,6 +59,30 @@ async def upload_document(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+# Batch upload: returns a job id immediately, files are processed in the background
+@app.post("/documents/upload/batch", status_code=202)
+async def upload_documents_batch(
+    background_tasks: BackgroundTasks,
+    files: List[UploadFile] = File(...),
+    user_id: str = Form(None)
+):
+    if not IMPORTS_SUCCESSFUL:
+        raise HTTPException(status_code=500, detail="Service imports failed")
+    # Read uploads now; they are closed once the response is sent
+    contents = [await f.read() for f in files]
+    job = create_batch_job(user_id, [f.filename for f in files])
+    background_tasks.add_task(run_batch_job, job, contents)
+    return {"job_id": job.job_id, "status": job.status, "files": len(files)}
+
+@app.get("/documents/jobs/{job_id}")
+async def get_batch_job_status(job_id: str):
+    if not IMPORTS_SUCCESSFUL:
+        raise HTTPException(status_code=500, detail="Service imports failed")
+    job = get_batch_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.dict()
+
 @app.get("/analysis/{documentId}")
 async def get_analysis(documentId: str):
     if not IMPORTS_SUCCESSFUL:
@@ -25,3 +25,18 @@ class AnalysisReport(BaseModel):
     decision_assist: DecisionAssist = Field(default_factory=DecisionAssist)
     clause_hits: Dict[str, List[str]] = {}
     meta: Dict[str, Any] = {}
+
+class BatchFileStatus(BaseModel):
+    filename: str
+    status: str = "queued"  # queued | extracting | embedding | summarizing | saving | done | failed
+    doc_id: Optional[str] = None
+    error: Optional[str] = None
+
+class BatchJob(BaseModel):
+    job_id: str
+    user_id: Optional[str] = None
+    status: str = "queued"  # queued | running | completed | completed_with_errors | failed
+    files: List[BatchFileStatus] = []
+    completed: int = 0
+    failed: int = 0
+    finished_at: Optional[float] = None
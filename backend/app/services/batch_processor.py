@@ -0,0 +1,162 @@
+# backend/app/services/batch_processor.py
+import asyncio
+import os
+import time
+import uuid
+from contextlib import ExitStack
+from app.models import BatchJob, BatchFileStatus
+from app.services.cache_manager import get_cache_manager
+from app.services.document_processor import extract_document
+from app.services.summarizer import summarize_document
+from app.services.qa_engine import load_or_build_store
+from app.services.firestore_manager import save_document_summaries
+
+# Per-stage concurrency limits; OCR is CPU-bound, summarization waits on Vertex
+EXTRACT_CONCURRENCY = int(os.environ.get("BATCH_EXTRACT_CONCURRENCY", os.cpu_count() or 2))
+EMBED_CONCURRENCY = int(os.environ.get("BATCH_EMBED_CONCURRENCY", 1))
+SUMMARIZE_CONCURRENCY = int(os.environ.get("BATCH_SUMMARIZE_CONCURRENCY", 4))
+# Summaries are committed to Firestore once this many are queued, or once the oldest
+# queued summary has waited the flush interval
+WRITE_BATCH_SIZE = int(os.environ.get("BATCH_WRITE_SIZE", 10))
+WRITE_FLUSH_SECONDS = float(os.environ.get("BATCH_WRITE_FLUSH_SECONDS", 2))
+# Finished jobs stay pollable for this long
+JOB_TTL_SECONDS = float(os.environ.get("BATCH_JOB_TTL_SECONDS", 3600))
+
+# In-memory job registry (job_id -> BatchJob)
+BATCH_JOBS = {}
+
+# Stage semaphores shared by every job in this worker, bound to the running loop
+_STAGE_SEMAPHORES = None
+
+
+def _stage_semaphores():
+    global _STAGE_SEMAPHORES
+    loop = asyncio.get_running_loop()
+    if _STAGE_SEMAPHORES is None or _STAGE_SEMAPHORES[0] is not loop:
+        _STAGE_SEMAPHORES = (loop, asyncio.Semaphore(EXTRACT_CONCURRENCY),
+                             asyncio.Semaphore(EMBED_CONCURRENCY),
+                             asyncio.Semaphore(SUMMARIZE_CONCURRENCY))
+    return _STAGE_SEMAPHORES[1:]
+
+
+def _prune_jobs():
+    now = time.time()
+    expired = [job_id for job_id, job in BATCH_JOBS.items()
+               if job.finished_at and now - job.finished_at > JOB_TTL_SECONDS]
+    for job_id in expired:
+        del BATCH_JOBS[job_id]
+
+
+def create_batch_job(user_id, filenames):
+    _prune_jobs()
+    job = BatchJob(job_id=str(uuid.uuid4()), user_id=user_id,
+                   files=[BatchFileStatus(filename=name) for name in filenames])
+    BATCH_JOBS[job.job_id] = job
+    return job
+
+
+def get_batch_job(job_id):
+    _prune_jobs()
+    return BATCH_JOBS.get(job_id)
+
+
+async def run_batch_job(job: BatchJob, contents):
+    """Push every file through extract -> embed -> summarize, each stage under its own limit.
+
+    Files move independently, so one file's OCR overlaps another's LLM call. Stage limits
+    are shared with every other job in this worker. Finished summaries are handed to a
+    single writer that commits them to Firestore in batches.
+    """
+    job.status = "running"
+    extract_sem, embed_sem, summarize_sem = _stage_semaphores()
+    write_queue = asyncio.Queue()
+
+    def fail(f, e):
+        print(f"Batch {job.job_id}: {f.filename} failed: {e}")
+        f.status = "failed"
+        f.error = str(e)
+        job.failed += 1
+
+    async def process(f, data):
+        # Keep this file's extract and index out of eviction until it is done
+        with ExitStack() as pins:
+            try:
+                async with extract_sem:
+                    f.status = "extracting"
+                    doc_id, meta = await asyncio.to_thread(extract_document, f.filename, data, pins)
+                f.doc_id = doc_id
+                async with embed_sem:
+                    f.status = "embedding"
+                    text = get_cache_manager().read_extract(doc_id)
+                    try:
+                        await asyncio.to_thread(load_or_build_store, doc_id, text or "")
+                    except Exception as e:
+                        # Chat rebuilds the index lazily, so this is not fatal
+                        print(f"Batch {job.job_id}: embedding {f.filename} failed: {e}")
+                async with summarize_sem:
+                    f.status = "summarizing"
+                    summary = await summarize_document(doc_id)
+            except Exception as e:
+                fail(f, e)
+                return
+        # summarize_document reports failures as a payload instead of raising
+        error = summary.get("meta", {}).get("error")
+        if error:
+            fail(f, error)
+            return
+        f.status = "saving"
+        await write_queue.put((f, {"user_id": job.user_id, "doc_id": doc_id,
+                                   "doc_name": meta.get("filename", ""), "summary": summary}))
+
+    async def flush(pending):
+        try:
+            await asyncio.to_thread(save_document_summaries, [rec for _, rec in pending])
+        except Exception as e:
+            for f, _ in pending:
+                fail(f, e)
+            return
+        for f, _ in pending:
+            f.status = "done"
+            job.completed += 1
+
+    async def writer():
+        loop = asyncio.get_running_loop()
+        pending = []
+        deadline = None
+        while True:
+            # Wait no longer than the oldest pending summary's flush deadline
+            timeout = max(0, deadline - loop.time()) if pending else None
+            try:
+                item = await asyncio.wait_for(write_queue.get(), timeout=timeout)
+            except asyncio.TimeoutError:
+                await flush(pending)
+                pending = []
+                continue
+            if item is None:
+                break
+            if not pending:
+                deadline = loop.time() + WRITE_FLUSH_SECONDS
+            pending.append(item)
+            if len(pending) >= WRITE_BATCH_SIZE or loop.time() >= deadline:
+                await flush(pending)
+                pending = []
+        if pending:
+            await flush(pending)
+
+    writer_task = asyncio.create_task(writer())
+    final_status = "failed"
+    try:
+        await asyncio.gather(*(process(f, data) for f, data in zip(job.files, contents)))
+        await write_queue.put(None)
+        await writer_task
+        if job.failed == 0:
+            final_status = "completed"
+        elif job.completed:
+            final_status = "completed_with_errors"
+    finally:
+        writer_task.cancel()
+        for f in job.files:
+            if f.status not in ("done", "failed"):
+                fail(f, "Batch job aborted")
+        job.status = final_status
+        job.finished_at = time.time()
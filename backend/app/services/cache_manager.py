@@ -0,0 +1,317 @@
+# backend/app/services/cache_manager.py
+import os
+import shutil
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Optional
+
+TMP_PREFIX = ".tmp-"
+INDEX_PREFIX = "vs_hf-legal-bert_"
+EXTRACT_PREFIX = "extract_"
+
+# Eviction tiers: raw uploads go first, FAISS indexes (rebuilt on demand) next,
+# extracts last since /analysis and chat cannot recover without them
+TIER_UPLOAD = 0
+TIER_INDEX = 1
+TIER_EXTRACT = 2
+
+
+class _Entry:
+    __slots__ = ("size", "last_access", "hits", "created", "tier")
+
+    def __init__(self, size: int, last_access: float, hits: int, created: float, tier: int):
+        self.size = size
+        self.last_access = last_access
+        self.hits = hits
+        self.created = created
+        self.tier = tier
+
+
+def _disk_size(path: Path) -> int:
+    try:
+        if path.is_dir():
+            return sum(p.stat().st_size for p in path.rglob("*") if p.is_file())
+        return path.stat().st_size
+    except FileNotFoundError:
+        return 0
+
+
+def _remove(path: Path):
+    if path.is_dir():
+        shutil.rmtree(path, ignore_errors=True)
+    else:
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class CacheManager:
+    """Tracks CACHE_DIR (uploads, extracts) and DATA_DIR (FAISS indexes) under one byte budget.
+
+    Every top-level file in CACHE_DIR and every top-level directory in DATA_DIR is one
+    entry. Writes go to a temp name in the same directory and are renamed into place,
+    so readers in other workers only ever see complete files or indexes.
+
+    The directories are re-listed before every eviction pass, so the budget covers
+    files written by other workers too. Recency is shared between workers through
+    file atimes; LFU hit counts and pins are per process, and entries younger than
+    `grace_seconds` are only evicted once nothing older is left.
+    """
+
+    def __init__(self, cache_dir: Path, data_dir: Path, max_bytes: int, policy: str = "lru",
+                 grace_seconds: float = 300, tmp_stale_seconds: float = 3600):
+        if policy not in ("lru", "lfu"):
+            raise ValueError(f"Unknown cache eviction policy: {policy}")
+        self.cache_dir = Path(cache_dir)
+        self.data_dir = Path(data_dir)
+        self.max_bytes = max_bytes
+        self.policy = policy
+        self.grace_seconds = grace_seconds
+        self.tmp_stale_seconds = tmp_stale_seconds
+        self._entries: Dict[Path, _Entry] = {}
+        self._pins: Dict[Path, int] = {}
+        self._total = 0
+        self._lock = threading.Lock()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.scan()
+
+    # --- paths ---
+    def upload_path(self, filename: str) -> Path:
+        # Unique per call so concurrent uploads with the same filename never collide
+        return self.cache_dir / f"{uuid.uuid4().hex}_{Path(filename).name}"
+
+    def extract_path(self, fid: str) -> Path:
+        return self.cache_dir / f"{EXTRACT_PREFIX}{fid}.txt"
+
+    def index_path(self, doc_id: str) -> Path:
+        return self.data_dir / f"{INDEX_PREFIX}{doc_id}"
+
+    def _tier(self, path: Path) -> int:
+        if path.parent == self.data_dir:
+            return TIER_INDEX
+        if path.name.startswith(EXTRACT_PREFIX):
+            return TIER_EXTRACT
+        return TIER_UPLOAD
+
+    # --- accounting ---
+    def scan(self):
+        """Rebuild accounting from disk and drop stale temp files left by interrupted writes.
+
+        Temp files younger than `tmp_stale_seconds` may belong to a live worker and are kept.
+        """
+        now = time.time()
+        for root in (self.cache_dir, self.data_dir):
+            for path in root.iterdir():
+                if not path.name.startswith(TMP_PREFIX):
+                    continue
+                try:
+                    if now - path.stat().st_mtime >= self.tmp_stale_seconds:
+                        _remove(path)
+                except FileNotFoundError:
+                    pass
+        with self._lock:
+            self._entries = {}
+            self._total = 0
+        self.evict()
+
+    def _refresh(self):
+        """Sync accounting with what is on disk, picking up other workers' writes."""
+        seen = {}
+        for root in (self.cache_dir, self.data_dir):
+            for path in root.iterdir():
+                if path.name.startswith(TMP_PREFIX):
+                    continue
+                try:
+                    seen[path] = path.stat()
+                except FileNotFoundError:
+                    continue
+        with self._lock:
+            known = {p: e.size for p, e in self._entries.items()}
+        # Index directories are immutable once published, so only size new ones
+        sizes = {p: st.st_size if not p.is_dir() else known.get(p) or _disk_size(p)
+                 for p, st in seen.items()}
+        with self._lock:
+            for path in list(self._entries):
+                if path not in seen:
+                    self._total -= self._entries.pop(path).size
+            for path, st in seen.items():
+                entry = self._entries.get(path)
+                if entry is None:
+                    self._entries[path] = _Entry(sizes[path], max(st.st_atime, st.st_mtime), 0,
+                                                 st.st_mtime, self._tier(path))
+                    self._total += sizes[path]
+                else:
+                    entry.last_access = max(entry.last_access, st.st_atime)
+                    self._total += sizes[path] - entry.size
+                    entry.size = sizes[path]
+
+    def total_bytes(self) -> int:
+        return self._total
+
+    def touch(self, path: Path):
+        path = Path(path)
+        now_ns = time.time_ns()
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None:
+                entry.last_access = now_ns / 1e9
+                entry.hits += 1
+        # Bump atime only (st_mtime_ns feeds file_fingerprint) so other workers see the access
+        try:
+            os.utime(path, ns=(now_ns, path.stat().st_mtime_ns))
+        except OSError:
+            pass
+
+    def _record(self, path: Path):
+        size = _disk_size(path)
+        now = time.time()
+        with self._lock:
+            old = self._entries.pop(path, None)
+            if old is not None:
+                self._total -= old.size
+            self._entries[path] = _Entry(size, now, 0, now, self._tier(path))
+            self._total += size
+
+    @contextmanager
+    def pinned(self, *paths: Path):
+        """Keep `paths` out of eviction for the duration of the block.
+
+        Paths may be pinned before they exist, e.g. an extract that is about to be written.
+        """
+        paths = [Path(p) for p in paths]
+        with self._lock:
+            for p in paths:
+                self._pins[p] = self._pins.get(p, 0) + 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                for p in paths:
+                    self._pins[p] -= 1
+                    if not self._pins[p]:
+                        del self._pins[p]
+
+    def _victim(self, keep: Optional[Path]) -> Optional[Path]:
+        now = time.time()
+        candidates = [(p, e) for p, e in self._entries.items()
+                      if p != keep and p not in self._pins]
+        if not candidates:
+            return None
+
+        def key(pe):
+            e = pe[1]
+            in_grace = now - e.created < self.grace_seconds
+            if self.policy == "lfu":
+                return (in_grace, e.tier, e.hits, e.last_access)
+            return (in_grace, e.tier, e.last_access)
+
+        return min(candidates, key=key)[0]
+
+    def evict(self, keep: Optional[Path] = None):
+        """Remove entries until the budget is met, never evicting `keep` or pinned paths."""
+        self._refresh()
+        while True:
+            with self._lock:
+                if self._total <= self.max_bytes:
+                    return
+                victim = self._victim(keep)
+                if victim is None:
+                    return
+                entry = self._entries.pop(victim)
+                self._total -= entry.size
+            _remove(victim)
+
+    def remove(self, path: Path):
+        path = Path(path)
+        with self._lock:
+            entry = self._entries.pop(path, None)
+            if entry is not None:
+                self._total -= entry.size
+        _remove(path)
+
+    # --- reads ---
+    def read_text(self, path: Path) -> Optional[str]:
+        path = Path(path)
+        try:
+            text = path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+        self.touch(path)
+        return text
+
+    def read_extract(self, fid: str) -> Optional[str]:
+        return self.read_text(self.extract_path(fid))
+
+    # --- atomic writes ---
+    def _tmp_path(self, path: Path) -> Path:
+        return path.parent / f"{TMP_PREFIX}{uuid.uuid4().hex}-{path.name}"
+
+    def write_bytes(self, path: Path, data: bytes) -> Path:
+        path = Path(path)
+        tmp = self._tmp_path(path)
+        try:
+            with open(tmp, "wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, path)
+        except BaseException:
+            _remove(tmp)
+            raise
+        self._record(path)
+        self.evict(keep=path)
+        return path
+
+    def write_text(self, path: Path, text: str) -> Path:
+        return self.write_bytes(path, text.encode("utf-8"))
+
+    def write_extract(self, fid: str, text: str) -> Path:
+        return self.write_text(self.extract_path(fid), text)
+
+    @contextmanager
+    def atomic_dir(self, path: Path):
+        """Yield a temp directory that is renamed to `path` once the block succeeds.
+
+        If another worker published `path` first, its copy is kept and ours is discarded.
+        """
+        path = Path(path)
+        tmp = self._tmp_path(path)
+        tmp.mkdir(parents=True)
+        try:
+            yield tmp
+            try:
+                os.rename(tmp, path)
+            except OSError:
+                if not path.exists():
+                    raise
+                _remove(tmp)
+        except BaseException:
+            _remove(tmp)
+            raise
+        self._record(path)
+        self.evict(keep=path)
+
+
+_CACHE_MANAGER = None
+_CACHE_MANAGER_LOCK = threading.Lock()
+
+
+def get_cache_manager() -> CacheManager:
+    global _CACHE_MANAGER
+    if _CACHE_MANAGER is None:
+        with _CACHE_MANAGER_LOCK:
+            if _CACHE_MANAGER is None:
+                _CACHE_MANAGER = CacheManager(
+                    Path(os.environ.get("CACHE_DIR", "/tmp/cache")),
+                    Path(os.environ.get("DATA_DIR", "/tmp/data")),
+                    max_bytes=int(os.environ.get("CACHE_MAX_BYTES", 1024 * 1024 * 1024)),
+                    policy=os.environ.get("CACHE_EVICTION_POLICY", "lru").lower(),
+                    grace_seconds=float(os.environ.get("CACHE_GRACE_SECONDS", 300)),
+                    tmp_stale_seconds=float(os.environ.get("CACHE_TMP_STALE_SECONDS", 3600)),
+                )
+    return _CACHE_MANAGER
@@ -1,29 +1,45 @@
 # backend/app/services/document_processor.py
-import os
 import hashlib
-from pathlib import Path
+from contextlib import ExitStack
+from typing import Optional
 from fastapi import UploadFile
 from app.utils import file_fingerprint
+from app.services.cache_manager import get_cache_manager
 from app.services.extractor import Extractor
 
-CACHE_DIR = Path(os.getenv("CACHE_DIR", "/tmp/cache"))
-# Ensure cache directory exists
-CACHE_DIR.mkdir(parents=True, exist_ok=True)
+# Scans CACHE_DIR/DATA_DIR and rebuilds size accounting at startup
+cache = get_cache_manager()
 
-extractor = Extractor(CACHE_DIR)
+extractor = Extractor(cache)
 
 async def process_document(file: UploadFile):
-    ext = file.filename.lower().split('.')[-1]
     contents = await file.read()
-    temp_path = CACHE_DIR / file.filename
-    temp_path.write_bytes(contents)
-    if ext == "pdf":
-        text = extractor.from_pdf(str(temp_path))
-    elif ext in ["png", "jpg", "jpeg", "bmp", "tiff", "gif"]:
-        text = extractor.from_image(str(temp_path))
-    else:
+    return extract_document(file.filename, contents)
+
+def extract_document(filename: str, contents: bytes, pins: Optional[ExitStack] = None):
+    """Cache the upload and extract its text.
+
+    If `pins` is given, the document's extract and index stay pinned until it is closed.
+    """
+    ext = filename.lower().split('.')[-1]
+    if ext != "pdf" and ext not in ["png", "jpg", "jpeg", "bmp", "tiff", "gif"]:
         raise ValueError("Unsupported file type")
+    upload_path = cache.upload_path(filename)
+    try:
+        with cache.pinned(upload_path):
+            cache.write_bytes(upload_path, contents)
+            # Fingerprint before extracting; the extract write may trigger eviction
+            fid = file_fingerprint(str(upload_path))
+            if pins is not None:
+                pins.enter_context(cache.pinned(cache.extract_path(fid), cache.index_path(fid)))
+            with cache.pinned(cache.extract_path(fid)):
+                if ext == "pdf":
+                    text = extractor.from_pdf(str(upload_path))
+                else:
+                    text = extractor.from_image(str(upload_path))
+    finally:
+        # The raw upload is never read again, whether or not extraction succeeded
+        cache.remove(upload_path)
     print("file saved in cache successfully")
-    fid = file_fingerprint(str(temp_path))
-    meta = {"filename": file.filename, "fid": fid}
+    meta = {"filename": filename, "fid": fid}
     return fid, meta
@@ -1,23 +1,19 @@
 # backend/app/services/extractor.py
-from pathlib import Path
 from PIL import Image, ImageEnhance
 import pytesseract
 from PyPDF2 import PdfReader
 from app.utils import file_fingerprint
+from app.services.cache_manager import CacheManager
 
 class Extractor:
-    def __init__(self, cache_dir: Path):
-        self.cache_dir = cache_dir
-        self.cache_dir.mkdir(exist_ok=True, parents=True)
-
-    def _cache_path(self, fid: str) -> Path:
-        return self.cache_dir / f"extract_{fid}.txt"
+    def __init__(self, cache: CacheManager):
+        self.cache = cache
 
     def from_pdf(self, pdf_path: str) -> str:
         fid = file_fingerprint(pdf_path)
-        cpath = self._cache_path(fid)
-        if cpath.exists():
-            return cpath.read_text(encoding="utf-8")
+        cached = self.cache.read_extract(fid)
+        if cached is not None:
+            return cached
         with open(pdf_path, "rb") as f:
             reader = PdfReader(f)
             parts = []
@@ -28,14 +24,14 @@ class Extractor:
             text = "\n".join(parts).strip() or ""
         if not text:
             text = "No readable text found."
-        cpath.write_text(text, encoding="utf-8")
+        self.cache.write_extract(fid, text)
         return text
 
     def from_image(self, image_path: str, lang: str = "eng") -> str:
         fid = file_fingerprint(image_path)
-        cpath = self._cache_path(fid)
-        if cpath.exists():
-            return cpath.read_text(encoding="utf-8")
+        cached = self.cache.read_extract(fid)
+        if cached is not None:
+            return cached
         with Image.open(image_path) as im:
             if im.mode != "L":
                 im = im.convert("L")
@@ -43,5 +39,5 @@ class Extractor:
             im = ImageEnhance.Sharpness(im).enhance(1.8)
             text = pytesseract.image_to_string(im, config="--oem 3 --psm 6", lang=lang)
         text = text or "No readable text found."
-        cpath.write_text(text, encoding="utf-8")
+        self.cache.write_extract(fid, text)
         return text
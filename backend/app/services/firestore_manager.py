@@ -70,3 +70,20 @@ def save_document_summary(user_id, doc_id, doc_name, summary_json):
         "summary": summary_json,
         "upload_date": firestore.SERVER_TIMESTAMP
     })
+
+# Firestore caps a write batch at 500 operations
+FIRESTORE_BATCH_LIMIT = 500
+
+# Save many document summaries with batched commits
+def save_document_summaries(records):
+    for start in range(0, len(records), FIRESTORE_BATCH_LIMIT):
+        batch = db.batch()
+        for rec in records[start:start + FIRESTORE_BATCH_LIMIT]:
+            batch.set(db.collection("documents").document(rec["doc_id"]), {
+                "user_id": rec["user_id"],
+                "doc_id": rec["doc_id"],
+                "doc_name": rec["doc_name"],
+                "summary": rec["summary"],
+                "upload_date": firestore.SERVER_TIMESTAMP
+            })
+        batch.commit()
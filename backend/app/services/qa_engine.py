@@ -9,6 +9,7 @@ from langchain.prompts import PromptTemplate
 from langchain.chains import LLMChain
 from langchain_community.vectorstores import FAISS
 from langchain_community.embeddings import HuggingFaceEmbeddings
+from app.services.cache_manager import get_cache_manager
 
 # Lazy loading of embedding model to avoid startup issues
 EMBED_MODEL = None
@@ -31,6 +32,28 @@ def get_embed_model():
             )
     return EMBED_MODEL
 
+def load_or_build_store(doc_id: str, text: str):
+    cache = get_cache_manager()
+    emb = get_embed_model()  # Use lazy-loaded model
+    vs_path = cache.index_path(doc_id)
+    if vs_path.exists():
+        try:
+            store = FAISS.load_local(vs_path.as_posix(), emb, allow_dangerous_deserialization=True)
+            cache.touch(vs_path)
+            return store
+        except Exception as e:
+            # Index is corrupt or was evicted mid-load; drop it so the rebuild can be published
+            print(f"Failed to load vector store for {doc_id}: {e}")
+            cache.remove(vs_path)
+    from langchain.text_splitter import RecursiveCharacterTextSplitter
+    splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200)
+    docs = splitter.create_documents([text])
+    docs = [d for d in docs if len(d.page_content.strip()) >= 40]
+    store = FAISS.from_documents(docs, emb)
+    with cache.atomic_dir(vs_path) as tmp_path:
+        store.save_local(tmp_path.as_posix())
+    return store
+
 from collections import defaultdict, deque
 
 # In-memory user chat history (user_id -> deque of last 10 queries)
@@ -47,31 +70,14 @@ async def chat_with_documents(doc_ids, query, user_id=None):
         else:
             memory_context = query
         
-        # Get cache and data directories from environment
-        cache_dir = os.environ.get("CACHE_DIR", "/tmp/cache")
-        data_dir = os.environ.get("DATA_DIR", "/tmp/data")
-        
-        # Ensure directories exist
-        Path(cache_dir).mkdir(parents=True, exist_ok=True)
-        Path(data_dir).mkdir(parents=True, exist_ok=True)
-        
+        cache = get_cache_manager()
+
         all_context = []
         for doc_id in doc_ids:
-            cache_path = Path(cache_dir) / f"extract_{doc_id}.txt"
-            if not cache_path.exists():
+            text = cache.read_extract(doc_id)
+            if text is None:
                 continue
-            text = cache_path.read_text(encoding="utf-8")
-            emb = get_embed_model()  # Use lazy-loaded model
-            vs_path = Path(data_dir) / f"vs_hf-legal-bert_{doc_id}"
-            if vs_path.exists():
-                store = FAISS.load_local(vs_path.as_posix(), emb, allow_dangerous_deserialization=True)
-            else:
-                from langchain.text_splitter import RecursiveCharacterTextSplitter
-                splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200)
-                docs = splitter.create_documents([text])
-                docs = [d for d in docs if len(d.page_content.strip()) >= 40]
-                store = FAISS.from_documents(docs, emb)
-                store.save_local(vs_path.as_posix())
+            store = load_or_build_store(doc_id, text)
             results = store.similarity_search_with_score(memory_context, k=3)
             context = "\n\n".join([doc.page_content.strip() for doc, score in results if score >= 0.2])
             if context:
@@ -119,30 +125,13 @@ async def chat_with_documents(doc_ids, query, user_id=None):
 
 async def chat_with_document(doc_id: str, query: str):
     try:
-        # Get cache and data directories from environment
-        cache_dir = os.environ.get("CACHE_DIR", "/tmp/cache")
-        data_dir = os.environ.get("DATA_DIR", "/tmp/data")
-        
-        # Ensure directories exist
-        Path(cache_dir).mkdir(parents=True, exist_ok=True)
-        Path(data_dir).mkdir(parents=True, exist_ok=True)
-        
-        cache_path = Path(cache_dir) / f"extract_{doc_id}.txt"
-        if not cache_path.exists():
+        cache = get_cache_manager()
+
+        text = cache.read_extract(doc_id)
+        if text is None:
             raise FileNotFoundError("Document not found in cache.")
-        text = cache_path.read_text(encoding="utf-8")
         # Build vector store
-        emb = get_embed_model()  # Use lazy-loaded model
-        vs_path = Path(data_dir) / f"vs_hf-legal-bert_{doc_id}"
-        if vs_path.exists():
-            store = FAISS.load_local(vs_path.as_posix(), emb, allow_dangerous_deserialization=True)
-        else:
-            from langchain.text_splitter import RecursiveCharacterTextSplitter
-            splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200)
-            docs = splitter.create_documents([text])
-            docs = [d for d in docs if len(d.page_content.strip()) >= 40]
-            store = FAISS.from_documents(docs, emb)
-            store.save_local(vs_path.as_posix())
+        store = load_or_build_store(doc_id, text)
         # Search relevant chunks
         results = store.similarity_search_with_score(query, k=5)
         context = "\n\n".join([doc.page_content.strip() for doc, score in results if score >= 0.2])
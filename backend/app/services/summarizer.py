@@ -1,9 +1,11 @@
 # backend/app/services/summarizer.py
 from app.models import AnalysisReport
 import re, json, os
+import asyncio
 from langchain_google_vertexai import ChatVertexAI
 from langchain.prompts import PromptTemplate
 from app.services.extractor import Extractor
+from app.services.cache_manager import get_cache_manager
 from pathlib import Path
 
 def coerce_report_fields(result):
@@ -82,13 +84,9 @@ def coerce_report_fields(result):
 async def summarize_document(doc_id: str):
     try:
         # For MVP, load extracted text from cache
-        cache_dir = os.environ.get("CACHE_DIR", "/tmp/cache")
-        # Ensure cache directory exists
-        Path(cache_dir).mkdir(parents=True, exist_ok=True)
-        cache_path = Path(cache_dir) / f"extract_{doc_id}.txt"
-        if not cache_path.exists():
+        text = get_cache_manager().read_extract(doc_id)
+        if text is None:
             raise FileNotFoundError("Document not found in cache.")
-        text = cache_path.read_text(encoding="utf-8")
         chunks = chunk_text(text)
         # Use Gemini 2.5 Flash via Langchain
         # Set credentials if not already set
@@ -114,7 +112,8 @@ async def summarize_document(doc_id: str):
             ),
         )
         big_text = "\n\n".join(chunks)[:20000]
-        resp = llm.invoke(prompt.format(document_text=big_text))
+        # Run the blocking Vertex call off the event loop so other requests keep moving
+        resp = await asyncio.to_thread(llm.invoke, prompt.format(document_text=big_text))
         # Gemini returns an AIMessage object, get the text
         if hasattr(resp, "content"):
             resp_text = resp.content
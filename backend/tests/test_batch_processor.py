@@ -0,0 +1,192 @@
+import asyncio
+import importlib
+import sys
+import time
+import types
+
+import pytest
+
+from app.services.cache_manager import CacheManager
+
+# Service modules that connect to Firestore/Vertex or load OCR and embedding libraries
+# at import; the pipeline only needs the functions each test patches in
+SERVICE_MODULES = {
+    "app.services.document_processor": "extract_document",
+    "app.services.summarizer": "summarize_document",
+    "app.services.qa_engine": "load_or_build_store",
+    "app.services.firestore_manager": "save_document_summaries",
+}
+
+
+@pytest.fixture
+def saved():
+    return []
+
+
+@pytest.fixture
+def bp(monkeypatch, tmp_path, saved):
+    for name, attr in SERVICE_MODULES.items():
+        module = types.ModuleType(name)
+        setattr(module, attr, None)
+        monkeypatch.setitem(sys.modules, name, module)
+    monkeypatch.delitem(sys.modules, "app.services.batch_processor", raising=False)
+    module = importlib.import_module("app.services.batch_processor")
+    cache = CacheManager(tmp_path / "cache", tmp_path / "data", max_bytes=10_000)
+    monkeypatch.setattr(module, "get_cache_manager", lambda: cache)
+    monkeypatch.setattr(module, "WRITE_FLUSH_SECONDS", 0.05)
+
+    def extract_document(filename, contents, pins=None):
+        if filename.endswith(".doc"):
+            raise ValueError("Unsupported file type")
+        fid = filename.replace(".", "_")
+        cache.write_extract(fid, contents.decode())
+        return fid, {"filename": filename, "fid": fid}
+
+    async def summarize_document(doc_id):
+        return {"summary": [doc_id], "meta": {}}
+
+    monkeypatch.setattr(module, "extract_document", extract_document)
+    monkeypatch.setattr(module, "summarize_document", summarize_document)
+    monkeypatch.setattr(module, "load_or_build_store", lambda doc_id, text: None)
+    monkeypatch.setattr(module, "save_document_summaries", lambda records: saved.append(records))
+    yield module
+    module.BATCH_JOBS.clear()
+
+
+def run_job(bp, filenames):
+    job = bp.create_batch_job("user-1", filenames)
+    asyncio.run(bp.run_batch_job(job, [b"some text" for _ in filenames]))
+    return job
+
+
+def statuses(job):
+    return {f.filename: f.status for f in job.files}
+
+
+def saved_ids(saved):
+    return [rec["doc_id"] for batch in saved for rec in batch]
+
+
+def test_all_files_succeed(bp, saved):
+    job = run_job(bp, ["a.pdf", "b.png"])
+    assert job.status == "completed"
+    assert job.completed == 2 and job.failed == 0
+    assert sorted(saved_ids(saved)) == ["a_pdf", "b_png"]
+    assert job.finished_at is not None
+
+
+def test_extraction_failure_marks_file_failed(bp, saved):
+    job = run_job(bp, ["a.pdf", "bad.doc"])
+    assert statuses(job) == {"a.pdf": "done", "bad.doc": "failed"}
+    assert job.files[1].error == "Unsupported file type"
+    assert job.status == "completed_with_errors"
+    assert saved_ids(saved) == ["a_pdf"]
+
+
+def test_summarizer_error_payload_is_not_saved(bp, saved, monkeypatch):
+    async def summarize_document(doc_id):
+        return {"summary": ["Error"], "meta": {"error": "Vertex down"}}
+
+    monkeypatch.setattr(bp, "summarize_document", summarize_document)
+    job = run_job(bp, ["a.pdf"])
+    assert statuses(job) == {"a.pdf": "failed"}
+    assert job.files[0].error == "Vertex down"
+    assert job.status == "failed"
+    assert saved == []
+
+
+def test_embedding_failure_is_not_fatal(bp, monkeypatch):
+    def load_or_build_store(doc_id, text):
+        raise RuntimeError("model unavailable")
+
+    monkeypatch.setattr(bp, "load_or_build_store", load_or_build_store)
+    job = run_job(bp, ["a.pdf"])
+    assert statuses(job) == {"a.pdf": "done"}
+    assert job.status == "completed"
+
+
+def test_write_failure_fails_pending_batch(bp, monkeypatch):
+    def save_document_summaries(records):
+        raise RuntimeError("Firestore unavailable")
+
+    monkeypatch.setattr(bp, "save_document_summaries", save_document_summaries)
+    monkeypatch.setattr(bp, "WRITE_FLUSH_SECONDS", 60)
+    job = run_job(bp, ["a.pdf", "b.pdf"])
+    assert statuses(job) == {"a.pdf": "failed", "b.pdf": "failed"}
+    assert all(f.error == "Firestore unavailable" for f in job.files)
+    assert job.status == "failed"
+
+
+def test_writer_flushes_on_deadline_despite_steady_arrivals(bp, monkeypatch):
+    flush_times = []
+
+    async def summarize_document(doc_id):
+        # Arrivals every 20 ms never leave the queue idle for the 50 ms flush interval
+        await asyncio.sleep(0.02 * int(doc_id.split("_")[0]))
+        return {"summary": [doc_id], "meta": {}}
+
+    monkeypatch.setattr(bp, "summarize_document", summarize_document)
+    monkeypatch.setattr(bp, "save_document_summaries",
+                        lambda records: flush_times.append(time.monotonic()))
+    monkeypatch.setattr(bp, "SUMMARIZE_CONCURRENCY", 20)
+    job = run_job(bp, [f"{i}.pdf" for i in range(1, 11)])
+    assert job.status == "completed"
+    # An idle-timeout writer would hold all ten until WRITE_BATCH_SIZE is reached
+    assert len(flush_times) > 1
+
+
+def test_stage_limits_are_shared_across_jobs(bp, monkeypatch):
+    active = 0
+    peak = 0
+
+    async def summarize_document(doc_id):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return {"summary": [doc_id], "meta": {}}
+
+    monkeypatch.setattr(bp, "summarize_document", summarize_document)
+    monkeypatch.setattr(bp, "SUMMARIZE_CONCURRENCY", 2)
+    jobs = [bp.create_batch_job("user-1", [f"{j}_{i}.pdf" for i in range(4)]) for j in range(3)]
+
+    async def run_all():
+        await asyncio.gather(*(bp.run_batch_job(job, [b"text"] * 4) for job in jobs))
+
+    asyncio.run(run_all())
+    assert peak == 2
+    assert all(job.status == "completed" for job in jobs)
+
+
+def test_aborted_job_reaches_final_status(bp, monkeypatch):
+    async def scenario():
+        started = asyncio.Event()
+
+        async def summarize_document(doc_id):
+            started.set()
+            await asyncio.sleep(60)
+
+        monkeypatch.setattr(bp, "summarize_document", summarize_document)
+        job = bp.create_batch_job("user-1", ["a.pdf"])
+        task = asyncio.create_task(bp.run_batch_job(job, [b"text"]))
+        await started.wait()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return job
+
+    job = asyncio.run(scenario())
+    assert job.status == "failed"
+    assert statuses(job) == {"a.pdf": "failed"}
+    assert job.files[0].error == "Batch job aborted"
+    assert job.finished_at is not None
+
+
+def test_finished_jobs_expire_after_ttl(bp, monkeypatch):
+    done = run_job(bp, ["a.pdf"])
+    running = bp.create_batch_job("user-1", ["b.pdf"])
+    assert bp.get_batch_job(done.job_id) is done
+    done.finished_at = time.time() - bp.JOB_TTL_SECONDS - 1
+    assert bp.get_batch_job(done.job_id) is None
+    assert bp.get_batch_job(running.job_id) is running
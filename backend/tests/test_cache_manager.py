@@ -0,0 +1,185 @@
+import os
+import time
+
+import pytest
+
+from app.services.cache_manager import CacheManager
+from app.utils import file_fingerprint
+
+
+def make_cache(tmp_path, max_bytes=1000, policy="lru", grace_seconds=0, **kwargs):
+    return CacheManager(tmp_path / "cache", tmp_path / "data", max_bytes=max_bytes,
+                        policy=policy, grace_seconds=grace_seconds, **kwargs)
+
+
+def names(cache):
+    return sorted(p.name for root in (cache.cache_dir, cache.data_dir) for p in root.iterdir())
+
+
+def test_lru_evicts_least_recently_used(tmp_path):
+    cache = make_cache(tmp_path, max_bytes=20)
+    cache.write_extract("a", "0123456789")
+    time.sleep(0.01)
+    cache.write_extract("b", "0123456789")
+    time.sleep(0.01)
+    cache.read_extract("a")
+    cache.write_extract("c", "0123456789")
+    assert names(cache) == ["extract_a.txt", "extract_c.txt"]
+    assert cache.total_bytes() == 20
+
+
+def test_lfu_evicts_least_frequently_used(tmp_path):
+    cache = make_cache(tmp_path, max_bytes=20, policy="lfu")
+    cache.write_extract("a", "0123456789")
+    cache.write_extract("b", "0123456789")
+    cache.read_extract("b")
+    cache.read_extract("b")
+    cache.read_extract("a")
+    cache.write_extract("c", "0123456789")
+    assert names(cache) == ["extract_b.txt", "extract_c.txt"]
+
+
+def test_lfu_grace_period_protects_new_entries(tmp_path):
+    cache = make_cache(tmp_path, max_bytes=20, policy="lfu", grace_seconds=3600)
+    old_path = cache.write_extract("old", "0123456789")
+    cache.read_extract("old")
+    backdated = time.time() - 7200
+    os.utime(old_path, (backdated, backdated))
+    cache._entries[old_path].created = backdated
+    cache.write_extract("new1", "0123456789")
+    cache.write_extract("new2", "0123456789")
+    assert "extract_old.txt" not in names(cache)
+
+
+def test_budget_is_enforced(tmp_path):
+    cache = make_cache(tmp_path, max_bytes=50)
+    for i in range(10):
+        cache.write_extract(str(i), "0123456789")
+        assert cache.total_bytes() <= 50
+    assert len(names(cache)) == 5
+
+
+def test_indexes_are_evicted_before_extracts(tmp_path):
+    cache = make_cache(tmp_path, max_bytes=20)
+    with cache.atomic_dir(cache.index_path("a")) as tmp:
+        (tmp / "index.faiss").write_bytes(b"0123456789")
+    time.sleep(0.01)
+    cache.write_extract("a", "0123456789")
+    cache.read_extract("a")
+    cache.write_extract("b", "0123456789")
+    assert names(cache) == ["extract_a.txt", "extract_b.txt"]
+
+
+def test_pinned_entries_are_not_evicted(tmp_path):
+    cache = make_cache(tmp_path, max_bytes=20)
+    cache.write_extract("a", "0123456789")
+    time.sleep(0.01)
+    cache.write_extract("b", "0123456789")
+    with cache.pinned(cache.extract_path("a")):
+        cache.write_extract("c", "0123456789")
+    assert names(cache) == ["extract_a.txt", "extract_c.txt"]
+
+
+def test_upload_survives_its_own_extract_under_lfu(tmp_path):
+    cache = make_cache(tmp_path, max_bytes=1000, policy="lfu")
+    for i in range(10):
+        cache.write_extract(f"old{i}", "x" * 90)
+        cache.read_extract(f"old{i}")
+    upload = cache.upload_path("lease.pdf")
+    with cache.pinned(upload):
+        cache.write_bytes(upload, b"y" * 100)
+        fid = file_fingerprint(str(upload))
+        cache.write_extract(fid, "z" * 100)
+        assert upload.exists()
+    assert cache.extract_path(fid).exists()
+
+
+def test_touch_preserves_fingerprint(tmp_path):
+    cache = make_cache(tmp_path)
+    path = cache.write_extract("a", "0123456789")
+    before = file_fingerprint(str(path))
+    time.sleep(0.01)
+    cache.touch(path)
+    assert file_fingerprint(str(path)) == before
+
+
+def test_scan_rebuilds_accounting(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.write_extract("a", "0123456789")
+    with cache.atomic_dir(cache.index_path("a")) as tmp:
+        (tmp / "index.faiss").write_bytes(b"01234")
+    again = make_cache(tmp_path)
+    assert again.total_bytes() == 15
+
+
+def test_scan_evicts_down_to_budget(tmp_path):
+    cache = make_cache(tmp_path)
+    for i in range(5):
+        cache.write_extract(str(i), "0123456789")
+    again = make_cache(tmp_path, max_bytes=30)
+    assert again.total_bytes() == 30
+    assert len(names(again)) == 3
+
+
+def test_scan_keeps_fresh_temp_files_and_drops_stale_ones(tmp_path):
+    cache = make_cache(tmp_path)
+    stale = cache.cache_dir / ".tmp-stale-extract_a.txt"
+    stale.write_text("x")
+    old = time.time() - 7200
+    os.utime(stale, (old, old))
+    with cache.atomic_dir(cache.index_path("a")) as tmp:
+        (tmp / "index.faiss").write_bytes(b"01234")
+        make_cache(tmp_path)
+        assert tmp.exists()
+    assert not stale.exists()
+    assert cache.index_path("a").exists()
+
+
+def test_writes_from_other_workers_count_toward_budget(tmp_path):
+    first = make_cache(tmp_path, max_bytes=20)
+    second = make_cache(tmp_path, max_bytes=20)
+    first.write_extract("a", "0123456789")
+    time.sleep(0.01)
+    second.write_extract("b", "0123456789")
+    time.sleep(0.01)
+    first.write_extract("c", "0123456789")
+    assert names(first) == ["extract_b.txt", "extract_c.txt"]
+
+
+def test_write_is_atomic_and_leaves_no_temp_files(tmp_path):
+    cache = make_cache(tmp_path)
+    path = cache.write_extract("a", "first")
+    cache.write_extract("a", "second")
+    assert path.read_text() == "second"
+    assert names(cache) == ["extract_a.txt"]
+    assert cache.total_bytes() == 6
+
+
+def test_atomic_dir_failure_publishes_nothing(tmp_path):
+    cache = make_cache(tmp_path)
+    with pytest.raises(RuntimeError):
+        with cache.atomic_dir(cache.index_path("a")) as tmp:
+            (tmp / "index.faiss").write_bytes(b"partial")
+            raise RuntimeError("save failed")
+    assert names(cache) == []
+
+
+def test_atomic_dir_keeps_first_published_copy(tmp_path):
+    cache = make_cache(tmp_path)
+    with cache.atomic_dir(cache.index_path("a")) as tmp:
+        (tmp / "index.faiss").write_bytes(b"first")
+    with cache.atomic_dir(cache.index_path("a")) as tmp:
+        (tmp / "index.faiss").write_bytes(b"second")
+    assert (cache.index_path("a") / "index.faiss").read_bytes() == b"first"
+    assert names(cache) == ["vs_hf-legal-bert_a"]
+
+
+def test_remove_allows_republishing_index(tmp_path):
+    cache = make_cache(tmp_path)
+    with cache.atomic_dir(cache.index_path("a")) as tmp:
+        (tmp / "index.faiss").write_bytes(b"corrupt")
+    cache.remove(cache.index_path("a"))
+    with cache.atomic_dir(cache.index_path("a")) as tmp:
+        (tmp / "index.faiss").write_bytes(b"rebuilt")
+    assert (cache.index_path("a") / "index.faiss").read_bytes() == b"rebuilt"
+    assert cache.total_bytes() == 7